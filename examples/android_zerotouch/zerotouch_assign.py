@@ -14,45 +14,110 @@ from __future__ import annotations
 import argparse
 import csv
 import json
+import os
 from datetime import datetime
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+COLUMNS = ("serial", "imei", "asset_tag", "site", "owner_group")
+WAREHOUSE_CONFIG = "cfg-android-warehouse-cobo"
+CORP_CONFIG = "cfg-android-corp-cope"
 
 def pick_config(row: Dict[str, str]) -> str:
     # Simple rules engine demo
     site = (row.get("site") or "").lower()
     if "warehouse" in site:
-        return "cfg-android-warehouse-cobo"
-    return "cfg-android-corp-cope"
+        return WAREHOUSE_CONFIG
+    return CORP_CONFIG
+
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, separators=(",", ":")).encode("utf-8")
 
-def run(input_csv: Path) -> Dict:
-    assignments=[]
+def run(input_csv: Path, out_path: Path) -> int:
+    # Stream one record per CSV row so memory stays flat for large inventories.
+    count=0
     with input_csv.open(newline="", encoding="utf-8") as f:
-        reader=csv.DictReader(f)
-        for row in reader:
-            assignments.append({
-                "serial": row.get("serial"),
-                "imei": row.get("imei"),
-                "asset_tag": row.get("asset_tag"),
-                "site": row.get("site"),
-                "owner_group": row.get("owner_group"),
-                "config": pick_config(row),
-            })
-    return {
+        reader=csv.reader(f)
+        header=next(reader, [])  # empty file: no header, no rows, empty plan
+        idx={name: i for i, name in enumerate(header)}
+        # Columns the file doesn't have point at a trailing None slot, so they
+        # come out as null like DictReader.get() did.
+        width=len(header)
+        i_serial, i_imei, i_asset, i_site, i_owner = (idx.get(c, width) for c in COLUMNS)
+        # Stream into a sibling temp file and swap it in only once the plan is
+        # complete, so a failure mid-stream leaves the previous plan intact.
+        tmp_path=out_path.with_name(out_path.name + ".tmp")
+        try:
+            with tmp_path.open("wb") as out:
+                out.write(b'{"generated_at":' + dumps(datetime.utcnow().isoformat() + "Z") + b',"assignments":[')
+                for row in reader:
+                    if not row:
+                        continue
+                    if len(row) != width:
+                        row=row[:width] + [None] * (width - len(row))
+                    row.append(None)
+                    site=row[i_site]
+                    if count:
+                        out.write(b",")
+                    # pick_config() inlined: one less Python call per row
+                    out.write(dumps({
+                        "serial": row[i_serial],
+                        "imei": row[i_imei],
+                        "asset_tag": row[i_asset],
+                        "site": site,
+                        "owner_group": row[i_owner],
+                        "config": WAREHOUSE_CONFIG if site and "warehouse" in site.lower() else CORP_CONFIG,
+                    }))
+                    count+=1
+                out.write(b'],"count":%d}' % count)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+    os.replace(tmp_path, out_path)
+    return count
+
+def run_fast(input_csv: Path, out_path: Path) -> int:
+    """
+    Vectorized variant of run() for very large inventories (pandas/numpy).
+    Imported lazily so the default path doesn't pay the pandas import cost.
+    Note: short rows yield "" here rather than null.
+    """
+    import numpy as np
+    import pandas as pd
+
+    try:
+        df=pd.read_csv(input_csv, dtype=str, keep_default_na=False, usecols=lambda c: c in COLUMNS)
+    except pd.errors.EmptyDataError:
+        df=pd.DataFrame(columns=list(COLUMNS))
+    # Columns the file doesn't have come out as null, as in run().
+    df=df.reindex(columns=list(COLUMNS)).astype(object)
+    df=df.where(df.notna(), None)
+    site=df["site"].fillna("").astype(str)
+    df["config"]=np.where(site.str.lower().str.contains("warehouse", regex=False), WAREHOUSE_CONFIG, CORP_CONFIG)
+    plan={
         "generated_at": datetime.utcnow().isoformat() + "Z",
-        "count": len(assignments),
-        "assignments": assignments,
+        "assignments": df.to_dict("records"),
+        "count": len(df),
     }
+    out_path.write_bytes(dumps(plan))
+    return len(df)
 
 def main() -> int:
     ap=argparse.ArgumentParser()
     ap.add_argument("--input", required=True, type=Path)
     ap.add_argument("--out", required=True, type=Path)
+    ap.add_argument("--fast", action="store_true", help="Use pandas/numpy (large inventories; requires pandas)")
     args=ap.parse_args()
 
-    plan=run(args.input)
-    args.out.write_text(json.dumps(plan, indent=2), encoding="utf-8")
-    print(f"Wrote plan: {args.out} ({plan['count']} devices)")
+    count=(run_fast if args.fast else run)(args.input, args.out)
+    print(f"Wrote plan: {args.out} ({count} devices)")
     return 0
 
 if __name__ == "__main__":
@@ -15,15 +15,29 @@ import base64
 import json
 import time
 from dataclasses import dataclass
-from datetime import datetime, timedelta, timezone
+from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict
 
-import requests
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 def b64url(data: bytes) -> str:
     return base64.urlsafe_b64encode(data).rstrip(b"=").decode("ascii")
 
+def dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode()
+
+@lru_cache(maxsize=None)
+def header_b64(key_id: str) -> str:
+    # The header only varies by key id, so encode it once per key.
+    return b64url(dumps({"alg": "ES256", "kid": key_id, "typ": "JWT"}))
+
 @dataclass
 class JwtConfig:
     issuer_id: str
@@ -34,15 +48,14 @@ def create_jwt(cfg: JwtConfig, ttl_minutes: int = 15) -> str:
     # Minimal JWT construction (no external crypto libs) — for interview clarity.
     # In real use: use `pyjwt` or `cryptography` and ES256 signing.
     # Here we *do not* sign; we emit a clearly-marked placeholder token.
-    header = {"alg": "ES256", "kid": cfg.key_id, "typ": "JWT"}
-    now = datetime.now(timezone.utc)
+    now_s = int(time.time())
     payload = {
         "iss": cfg.issuer_id,
-        "iat": int(now.timestamp()),
-        "exp": int((now + timedelta(minutes=ttl_minutes)).timestamp()),
+        "iat": now_s,
+        "exp": now_s + ttl_minutes * 60,
         "aud": "appstoreconnect-v1",
     }
-    unsigned = f"{b64url(json.dumps(header).encode())}.{b64url(json.dumps(payload).encode())}"
+    unsigned = f"{header_b64(cfg.key_id)}.{b64url(dumps(payload))}"
     return unsigned + ".SIGNATURE_PLACEHOLDER"
 
 def main() -> int:
@@ -17,6 +17,8 @@ RINGS = ["qa", "security", "early", "global"]
 def main() -> int:
     ap=argparse.ArgumentParser()
     ap.add_argument("--ring", required=True, choices=RINGS)
+    ap.add_argument("--simulate-delay-s", type=float, default=0.0,
+                    help="Seconds to sleep per simulated gate check (demo only; keep 0 in CI)")
     args=ap.parse_args()
 
     event = {
@@ -29,9 +31,11 @@ def main() -> int:
 
     # Simulate gate checks
     print("Running synthetic checks...")
-    time.sleep(1)
+    if args.simulate_delay_s:
+        time.sleep(args.simulate_delay_s)
     print("Checking endpoint KPIs (crash rate, login time, agent health)...")
-    time.sleep(1)
+    if args.simulate_delay_s:
+        time.sleep(args.simulate_delay_s)
     print(f"Promotion approved for ring: {args.ring}")
     return 0
 
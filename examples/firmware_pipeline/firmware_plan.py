@@ -14,7 +14,11 @@ from __future__ import annotations
 import argparse
 import json
 from pathlib import Path
-from packaging.version import Version
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
 
 TARGETS = {
     ("Dell", "Latitude 7440"): "1.6.0",
@@ -22,6 +26,25 @@ TARGETS = {
     ("Lenovo", "T14 Gen 4"): "1.3.0",
 }
 
+def parse_version(v: str) -> tuple[int, ...]:
+    # "1.6.0" -> (1, 6); trailing zeros dropped so 1.6 == 1.6.0 like Version()
+    t = tuple(int(x) for x in v.split("."))
+    while t and t[-1] == 0:
+        t = t[:-1]
+    return t
+
+# Parsed once at import instead of per inventory row.
+TARGETS_T = {k: parse_version(v) for k, v in TARGETS.items()}
+
+def needs_update(current: str, target: str, target_t: tuple[int, ...]) -> bool:
+    try:
+        return parse_version(current) < target_t
+    except (AttributeError, ValueError):
+        # non-numeric vendor schemes (e.g. "1.2.0a1"): fall back to full PEP 440
+        # parsing; imported lazily since the tuple path above covers most rows
+        from packaging.version import Version
+        return Version(current) < Version(target)
+
 def main() -> int:
     ap=argparse.ArgumentParser()
     ap.add_argument("--inventory", required=True, type=Path)
@@ -32,10 +55,11 @@ def main() -> int:
     plan=[]
     for d in inv:
         key=(d.get("vendor"), d.get("model"))
-        target = TARGETS.get(key)
-        if not target:
+        target_t = TARGETS_T.get(key)
+        if target_t is None:
             continue
-        if Version(d.get("bios")) < Version(target):
+        target = TARGETS[key]
+        if needs_update(d.get("bios"), target, target_t):
             plan.append({
                 "asset_tag": d.get("asset_tag"),
                 "vendor": d.get("vendor"),
@@ -44,7 +68,11 @@ def main() -> int:
                 "target_bios": target,
                 "ring": "qa",  # start safe
             })
-    args.out.write_text(json.dumps({"count": len(plan), "plan": plan}, indent=2), encoding="utf-8")
+    out = {"count": len(plan), "plan": plan}
+    if orjson is not None:
+        args.out.write_bytes(orjson.dumps(out, option=orjson.OPT_INDENT_2))
+    else:
+        args.out.write_text(json.dumps(out, indent=2), encoding="utf-8")
     print(f"Wrote firmware plan: {args.out} ({len(plan)} devices)")
     return 0
 
@@ -0,0 +1,30 @@
+"""
+JSON file reading shared by apply_config.py and policy_lint.py in this
+directory.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+MMAP_MIN_BYTES = 64 * 1024  # below this a plain read beats mmap setup
+
+
+def read_json(path: Path) -> Any:
+    if orjson is None:
+        return json.loads(path.read_text(encoding="utf-8"))
+    with path.open("rb") as f:
+        if os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return orjson.loads(f.read())
+        # large payloads: let orjson parse straight from the page cache
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+            return orjson.loads(mv)
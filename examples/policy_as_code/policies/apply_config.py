@@ -16,17 +16,37 @@ Notes:
 from __future__ import annotations
 
 import argparse
+import hashlib
 import json
 import os
+import time
+import xml.etree.ElementTree as ET
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, List, Optional, Tuple
 
-import requests
+if TYPE_CHECKING:
+    import requests
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+from _json_io import read_json
 
 ALLOWED_RINGS = {"qa", "security", "early", "global"}
 
+APPLY_WORKERS = 8
+
+# raw payload hash -> (shared payload str, profile_digest); see intern_payload()
+_xml_intern: Dict[bytes, Tuple[str, bytes]] = {}
+
+# profile name -> digest of the payload last applied/confirmed (see --state)
+_profile_digest_cache: Dict[str, bytes] = {}
+
 @dataclass
 class ApplyResult:
     policy_name: str
@@ -34,20 +54,94 @@ class ApplyResult:
     detail: str = ""
 
 def now_utc() -> str:
-    return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
+    return time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime())
 
 def load_policies(policies_dir: Path) -> List[Dict[str, Any]]:
-    policies: List[Dict[str, Any]] = []
-    for p in sorted(policies_dir.rglob("*.json")):
-        policies.append(json.loads(p.read_text(encoding="utf-8")))
+    paths = sorted(policies_dir.rglob("*.json"))
+    if not paths:
+        return []
+    # I/O bound: overlap reads across files; map() keeps the sorted order.
+    with ThreadPoolExecutor(max_workers=min(32, len(paths))) as ex:
+        policies = list(ex.map(read_json, paths))
+    for pol in policies:
+        pol["_supported_rings_set"] = supported_rings_set(pol)
+        settings = pol.get("settings")
+        if isinstance(settings, dict) and isinstance(settings.get("profile_plist_xml"), str):
+            settings["profile_plist_xml"], pol["_xml_digest"] = intern_payload(settings["profile_plist_xml"])
     return policies
 
-def is_policy_allowed_in_ring(policy: Dict[str, Any], ring: str) -> bool:
+def profile_digest(xml: str) -> bytes:
+    """
+    Digest of the C14N form of a profile payload, so whitespace between
+    elements and attribute order don't register as a change. Text values are
+    kept verbatim: <string> x </string> and <string>x</string> differ.
+    """
+    try:
+        root = ET.fromstring(xml.strip())
+    except ET.ParseError:
+        canon = xml.strip()  # not well-formed: fall back to the raw text
+    else:
+        # drop only whitespace-only text around child elements (indentation)
+        for el in root.iter():
+            if len(el):
+                if el.text is not None and not el.text.strip():
+                    el.text = None
+                for child in el:
+                    if child.tail is not None and not child.tail.strip():
+                        child.tail = None
+        canon = ET.canonicalize(xml_data=ET.tostring(root, encoding="unicode"))
+    return hashlib.blake2b(canon.encode("utf-8"), digest_size=16).digest()
+
+def intern_payload(xml: str) -> Tuple[str, bytes]:
+    """
+    Return a shared copy of a (stripped) profile payload and its profile_digest().
+    Policies cloned from a common base profile then share one string and are
+    canonicalized only once.
+    """
+    xml = xml.strip()
+    key = hashlib.blake2b(xml.encode("utf-8"), digest_size=16).digest()
+    hit = _xml_intern.get(key)
+    if hit is None:
+        hit = _xml_intern[key] = (xml, profile_digest(xml))
+    return hit
+
+def load_state(path: Path) -> Dict[str, bytes]:
+    if not path.exists():
+        return {}
+    return {k: bytes.fromhex(v) for k, v in read_json(path).items()}
+
+def save_state(path: Path, cache: Dict[str, bytes]) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps({k: v.hex() for k, v in sorted(cache.items())}, indent=2), encoding="utf-8")
+
+def supported_rings_set(policy: Dict[str, Any]) -> Optional[FrozenSet[str]]:
+    """None = no ring restriction; a malformed supported_rings allows no ring."""
     scope = policy.get("scope") or {}
     supported = scope.get("supported_rings")
     if supported is None:
-        return True
-    return isinstance(supported, list) and ring in supported
+        return None
+    if not isinstance(supported, list):
+        return frozenset()
+    # rings are strings, so other entries (incl. unhashable lists/dicts) can never match
+    return frozenset(r for r in supported if isinstance(r, str))
+
+def is_policy_allowed_in_ring(policy: Dict[str, Any], ring: str) -> bool:
+    # load_policies() precomputes the set; fall back for hand-built policies
+    if "_supported_rings_set" in policy:
+        rings = policy["_supported_rings_set"]
+    else:
+        rings = supported_rings_set(policy)
+    return rings is None or ring in rings
+
+def new_session() -> requests.Session:
+    # requests is imported here, not at module load, so lint/load-only paths
+    # don't pay for it. Keep-alive + pooled connections amortize TLS handshakes.
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    s = requests.Session()
+    s.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=16))
+    return s
 
 class JamfAuth:
     def __init__(self, jamf_url: str, username: str, password: str) -> None:
@@ -55,12 +149,13 @@ class JamfAuth:
         self.username = username
         self.password = password
         self._token: Optional[str] = None
+        self.session = new_session()
 
     def token(self) -> str:
         if self._token:
             return self._token
         endpoint = f"{self.jamf_url}/api/v1/auth/token"
-        r = requests.post(endpoint, auth=(self.username, self.password), timeout=30)
+        r = self.session.post(endpoint, auth=(self.username, self.password), timeout=30)
         r.raise_for_status()
         data = r.json()
         tok = data.get("token")
@@ -92,6 +187,26 @@ def build_classic_profile_xml(name: str, payload_xml: str) -> str:
 </os_x_configuration_profile>
 """
 
+def find_xml_payload(obj: Any) -> Optional[str]:
+    """
+    Return the first string in a decoded JSON tree that starts with "<?xml"
+    (leading whitespace ignored). Iterative, depth-first, in document order.
+    """
+    stack = deque([obj])
+    while stack:
+        o = stack.pop()
+        if isinstance(o, str):
+            i, n = 0, len(o)
+            while i < n and o[i].isspace():
+                i += 1
+            if o.startswith("<?xml", i):
+                return o
+        elif isinstance(o, dict):
+            stack.extend(reversed(o.values()))
+        elif isinstance(o, list):
+            stack.extend(reversed(o))
+    return None
+
 class JamfClassicConnector:
     """
     Implements:
@@ -103,60 +218,112 @@ class JamfClassicConnector:
     def __init__(self, jamf_url: str, token: str) -> None:
         self.jamf_url = jamf_url.rstrip("/")
         self.token = token
+        self.session = new_session()
 
     def get_profile_by_name(self, name: str) -> Optional[str]:
         url = f"{self.jamf_url}/JSSResource/osxconfigurationprofiles/name/{name}"
-        r = requests.get(url, headers=headers_json(self.token), timeout=30)
+        r = self.session.get(url, headers=headers_json(self.token), timeout=30)
         if r.status_code == 404:
             return None
         r.raise_for_status()
         obj = r.json()
 
         # extract payload string (best-effort; Jamf’s response structure can vary)
-        def scan(o: Any) -> Optional[str]:
-            if isinstance(o, str) and o.strip().startswith("<?xml"):
-                return o
-            if isinstance(o, dict):
-                for v in o.values():
-                    got = scan(v)
-                    if got:
-                        return got
-            if isinstance(o, list):
-                for v in o:
-                    got = scan(v)
-                    if got:
-                        return got
-            return None
-
-        return scan(obj)
+        return find_xml_payload(obj)
 
     def update_profile_by_name(self, name: str, payload_xml: str) -> None:
         url = f"{self.jamf_url}/JSSResource/osxconfigurationprofiles/name/{name}"
         body = build_classic_profile_xml(name, payload_xml)
-        r = requests.put(url, headers=headers_xml(self.token), data=body.encode("utf-8"), timeout=30)
+        r = self.session.put(url, headers=headers_xml(self.token), data=body.encode("utf-8"), timeout=30)
         r.raise_for_status()
 
     def create_profile(self, name: str, payload_xml: str) -> None:
         url = f"{self.jamf_url}/JSSResource/osxconfigurationprofiles/id/0"
         body = build_classic_profile_xml(name, payload_xml)
-        r = requests.post(url, headers=headers_xml(self.token), data=body.encode("utf-8"), timeout=30)
+        r = self.session.post(url, headers=headers_xml(self.token), data=body.encode("utf-8"), timeout=30)
         r.raise_for_status()
 
-def write_audit(out_path: Path, ring: str, change_id: str | None, results: List[ApplyResult]) -> None:
+@dataclass
+class Buckets:
+    actionable: List[Tuple[str, str, bytes]]  # (name, desired payload XML, profile_digest)
+    skipped_results: List[ApplyResult]  # decided without talking to Jamf
+
+def bucket_policies(policies: List[Dict[str, Any]], ring: str) -> Buckets:
+    """
+    Split policies up front into macOS Jamf profiles to apply and everything
+    else, with the latter's ApplyResult already materialized.
+    """
+    buckets = Buckets(actionable=[], skipped_results=[])
+    skipped = buckets.skipped_results
+
+    for pol in policies:
+        name = pol.get("name", "unknown")
+        md = pol.get("metadata") or {}
+
+        if md.get("emergency_use_only") is True:
+            skipped.append(ApplyResult(name, "skipped", "emergency-use-only policy (break-glass)"))
+            continue
+
+        if not is_policy_allowed_in_ring(pol, ring):
+            skipped.append(ApplyResult(name, "skipped", f"not allowed in ring={ring}"))
+            continue
+
+        if pol.get("platform") != "macos":
+            skipped.append(ApplyResult(name, "skipped", "non-macOS policy (Jamf example applies macOS profiles only)"))
+            continue
+
+        settings = pol.get("settings") or {}
+        if settings.get("type") != "jamf_configuration_profile":
+            skipped.append(ApplyResult(name, "skipped", "macOS policy not marked as jamf_configuration_profile"))
+            continue
+
+        desired_xml = (settings.get("profile_plist_xml") or "").strip()
+        if not desired_xml:
+            skipped.append(ApplyResult(name, "failed", "missing settings.profile_plist_xml"))
+            continue
+
+        want = pol.get("_xml_digest") or profile_digest(desired_xml)
+        buckets.actionable.append((name, desired_xml, want))
+
+    return buckets
+
+def apply_profile(jamf: JamfClassicConnector, name: str, desired_xml: str, want: bytes) -> ApplyResult:
+    try:
+        current_xml = jamf.get_profile_by_name(name)
+        if current_xml is not None and profile_digest(current_xml) == want:
+            _profile_digest_cache[name] = want
+            return ApplyResult(name, "no_change", "Jamf payload already matches")
+
+        if current_xml is None:
+            jamf.create_profile(name, desired_xml)
+            result = ApplyResult(name, "applied", "created profile")
+        else:
+            jamf.update_profile_by_name(name, desired_xml)
+            result = ApplyResult(name, "applied", "updated profile")
+        _profile_digest_cache[name] = want
+        return result
+
+    except Exception as e:
+        return ApplyResult(name, "failed", str(e))
+
+def write_audit(out_path: Path, ring: str, change_id: str | None, results: List[ApplyResult], counts: Counter) -> None:
     payload = {
         "timestamp": now_utc(),
         "ring": ring,
         "change_id": change_id,
         "summary": {
-            "applied": sum(1 for r in results if r.status == "applied"),
-            "no_change": sum(1 for r in results if r.status == "no_change"),
-            "skipped": sum(1 for r in results if r.status == "skipped"),
-            "failed": sum(1 for r in results if r.status == "failed"),
+            "applied": counts["applied"],
+            "no_change": counts["no_change"],
+            "skipped": counts["skipped"],
+            "failed": counts["failed"],
         },
         "results": [r.__dict__ for r in results],
     }
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    if orjson is not None:
+        out_path.write_bytes(orjson.dumps(payload, option=orjson.OPT_INDENT_2))
+    else:
+        out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
 
 def main() -> int:
     ap = argparse.ArgumentParser()
@@ -164,6 +331,8 @@ def main() -> int:
     ap.add_argument("--policies", required=True, type=Path)
     ap.add_argument("--change-id", required=False)
     ap.add_argument("--audit-out", default=Path("out/audit_apply.json"), type=Path)
+    ap.add_argument("--state", type=Path, required=False,
+                    help="JSON file of last-applied payload digests; unchanged profiles skip the Jamf GET")
     args = ap.parse_args()
 
     ring = args.ring.strip().lower()
@@ -183,66 +352,51 @@ def main() -> int:
         return 2
 
     policies = load_policies(args.policies)
+    if args.state:
+        _profile_digest_cache.update(load_state(args.state))
 
     # Auth + connector
     token = JamfAuth(jamf_url, jamf_user, jamf_pass).token()
     jamf = JamfClassicConnector(jamf_url, token)
 
     results: List[ApplyResult] = []
+    counts: Counter = Counter()  # tallied as results are recorded
+    work: List[Tuple[str, str, bytes]] = []
 
-    for pol in policies:
-        name = pol.get("name", "unknown")
-        md = pol.get("metadata") or {}
+    def record(result: ApplyResult) -> None:
+        results.append(result)
+        counts[result.status] += 1
 
-        if md.get("emergency_use_only") is True:
-            results.append(ApplyResult(name, "skipped", "emergency-use-only policy (break-glass)"))
-            continue
+    buckets = bucket_policies(policies, ring)
+    for result in buckets.skipped_results:
+        record(result)
 
-        if not is_policy_allowed_in_ring(pol, ring):
-            results.append(ApplyResult(name, "skipped", f"not allowed in ring={ring}"))
+    for name, desired_xml, want in buckets.actionable:
+        if _profile_digest_cache.get(name) == want:
+            record(ApplyResult(name, "no_change", "payload unchanged since last apply (state cache)"))
             continue
 
-        if pol.get("platform") != "macos":
-            results.append(ApplyResult(name, "skipped", "non-macOS policy (Jamf example applies macOS profiles only)"))
-            continue
+        work.append((name, desired_xml, want))
 
-        settings = pol.get("settings") or {}
-        if settings.get("type") != "jamf_configuration_profile":
-            results.append(ApplyResult(name, "skipped", "macOS policy not marked as jamf_configuration_profile"))
-            continue
+    # Network-bound: overlap the GET/PUT/POST round-trips across profiles.
+    if work:
+        with ThreadPoolExecutor(max_workers=min(APPLY_WORKERS, len(work))) as ex:
+            for result in ex.map(lambda w: apply_profile(jamf, *w), work):
+                record(result)
 
-        desired_xml = (settings.get("profile_plist_xml") or "").strip()
-        if not desired_xml:
-            results.append(ApplyResult(name, "failed", "missing settings.profile_plist_xml"))
-            continue
+    write_audit(args.audit_out, ring, args.change_id, results, counts)
+    if args.state:
+        save_state(args.state, _profile_digest_cache)
+
+    print(f"Applied={counts['applied']}, "
+          f"NoChange={counts['no_change']}, "
+          f"Skipped={counts['skipped']}, "
+          f"Failed={counts['failed']}")
 
-        try:
-            current_xml = jamf.get_profile_by_name(name)
-            if current_xml is not None and current_xml.strip() == desired_xml:
-                results.append(ApplyResult(name, "no_change", "Jamf payload already matches"))
-                continue
-
-            if current_xml is None:
-                jamf.create_profile(name, desired_xml)
-                results.append(ApplyResult(name, "applied", "created profile"))
-            else:
-                jamf.update_profile_by_name(name, desired_xml)
-                results.append(ApplyResult(name, "applied", "updated profile"))
-
-        except Exception as e:
-            results.append(ApplyResult(name, "failed", str(e)))
-
-    write_audit(args.audit_out, ring, args.change_id, results)
-
-    failed = [r for r in results if r.status == "failed"]
-    print(f"Applied={sum(1 for r in results if r.status=='applied')}, "
-          f"NoChange={sum(1 for r in results if r.status=='no_change')}, "
-          f"Skipped={sum(1 for r in results if r.status=='skipped')}, "
-          f"Failed={len(failed)}")
-
-    if failed:
-        for r in failed:
-            print(f"FAIL: {r.policy_name}: {r.detail}")
+    if counts["failed"]:
+        for r in results:
+            if r.status == "failed":
+                print(f"FAIL: {r.policy_name}: {r.detail}")
         return 1
     return 0
 
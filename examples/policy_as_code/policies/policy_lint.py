@@ -13,14 +13,27 @@ Exit codes:
 
 from __future__ import annotations
 
-import json
-import re
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Tuple
 
-SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:[-+].+)?$")
+try:
+    import re2 as _re  # optional: linear-time DFA matching, no backtracking
+except ImportError:
+    import re as _re
+
+try:
+    import fastjsonschema
+except ImportError:  # optional speedup; per-field checks below are the fallback
+    fastjsonschema = None
+
+from _json_io import read_json
+
+# Unanchored and always used with fullmatch(): re's "$" also matches before a
+# trailing newline and re2's doesn't, so "$" would make results engine-dependent.
+SEMVER_RE = _re.compile(r"(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)\.(0|[1-9][0-9]*)(?:[-+].+)?")
 
 REQUIRED_TOP = {"name", "platform", "version", "metadata", "settings"}
 REQUIRED_META = {"owner", "approver_groups", "change_ticket_required", "risk_level", "rollout_strategy"}
@@ -32,6 +45,41 @@ ALLOWED_RINGS = {"qa", "security", "early", "global"}
 
 BREAK_GLASS_NAMES = {"break-glass-exception", "break_glass_exception"}
 
+# Sorted once at import; only interpolated into messages when a check fails.
+_ALLOWED_PLATFORMS_SORTED = sorted(ALLOWED_PLATFORMS)
+_ALLOWED_RISK_SORTED = sorted(ALLOWED_RISK)
+_ALLOWED_ROLLOUT_SORTED = sorted(ALLOWED_ROLLOUT)
+
+
+# Mirrors the per-field checks in lint_fields(). A policy that passes this
+# schema passes those checks too, so they are only run to explain a failure.
+POLICY_SCHEMA = {
+    "type": "object",
+    "required": sorted(REQUIRED_TOP),
+    "properties": {
+        "name": {"type": "string", "pattern": r"\S"},
+        "platform": {"enum": _ALLOWED_PLATFORMS_SORTED},
+        "version": {"type": "string", "pattern": f"^{SEMVER_RE.pattern}$"},  # fastjsonschema: $ = end of string
+        "metadata": {
+            "type": "object",
+            "required": sorted(REQUIRED_META),
+            "properties": {
+                "risk_level": {"enum": _ALLOWED_RISK_SORTED},
+                "rollout_strategy": {"enum": _ALLOWED_ROLLOUT_SORTED},
+            },
+        },
+        "settings": {"type": "object"},
+        "scope": {
+            "type": "object",
+            "properties": {
+                "supported_rings": {"type": "array", "minItems": 1, "items": {"enum": sorted(ALLOWED_RINGS)}},
+            },
+        },
+    },
+}
+
+_validate = fastjsonschema.compile(POLICY_SCHEMA) if fastjsonschema is not None else None
+
 
 @dataclass
 class LintError:
@@ -41,23 +89,33 @@ class LintError:
 
 def load_json(path: Path) -> Tuple[Dict[str, Any] | None, str | None]:
     try:
-        return json.loads(path.read_text(encoding="utf-8")), None
+        return read_json(path), None
     except Exception as e:
         return None, str(e)
 
 
-def expect(cond: bool, path: Path, msg: str, errors: List[LintError]) -> None:
+def expect(cond: bool, path: Path, fmt: str, *args: Any, errors: List[LintError]) -> None:
+    # %-style so dynamic messages are only formatted on failure
     if not cond:
-        errors.append(LintError(str(path), msg))
+        errors.append(LintError(str(path), fmt % args if args else fmt))
 
 
-def lint_policy(path: Path, p: Dict[str, Any]) -> List[LintError]:
-    errors: List[LintError] = []
+def schema_ok(p: Any) -> bool:
+    if _validate is None:
+        return False
+    try:
+        _validate(p)
+    except fastjsonschema.JsonSchemaException:
+        return False
+    return True
+
 
-    missing = REQUIRED_TOP - set(p.keys())
-    expect(not missing, path, f"Missing top-level fields: {sorted(missing)}", errors)
+def lint_fields(path: Path, p: Dict[str, Any], errors: List[LintError]) -> bool:
+    """Per-field checks. Returns False if top-level fields are missing."""
+    missing = REQUIRED_TOP - p.keys()
+    expect(not missing, path, "Missing top-level fields: %s", sorted(missing), errors=errors)
     if missing:
-        return errors
+        return False
 
     name = p.get("name")
     platform = p.get("platform")
@@ -66,27 +124,43 @@ def lint_policy(path: Path, p: Dict[str, Any]) -> List[LintError]:
     settings = p.get("settings") or {}
     scope = p.get("scope") or {}
 
-    expect(isinstance(name, str) and name.strip(), path, "name must be a non-empty string", errors)
-    expect(platform in ALLOWED_PLATFORMS, path, f"platform must be one of {sorted(ALLOWED_PLATFORMS)}", errors)
-    expect(isinstance(version, str) and SEMVER_RE.match(version) is not None, path, "version must be semver (e.g., 1.2.3)", errors)
-    expect(isinstance(metadata, dict), path, "metadata must be an object", errors)
-    expect(isinstance(settings, dict), path, "settings must be an object", errors)
+    expect(isinstance(name, str) and name.strip(), path, "name must be a non-empty string", errors=errors)
+    expect(platform in ALLOWED_PLATFORMS, path, "platform must be one of %s", _ALLOWED_PLATFORMS_SORTED, errors=errors)
+    expect(isinstance(version, str) and SEMVER_RE.fullmatch(version) is not None, path, "version must be semver (e.g., 1.2.3)", errors=errors)
+    expect(isinstance(metadata, dict), path, "metadata must be an object", errors=errors)
+    expect(isinstance(settings, dict), path, "settings must be an object", errors=errors)
 
-    missing_meta = REQUIRED_META - set(metadata.keys())
-    expect(not missing_meta, path, f"Missing metadata fields: {sorted(missing_meta)}", errors)
+    missing_meta = REQUIRED_META - metadata.keys()
+    expect(not missing_meta, path, "Missing metadata fields: %s", sorted(missing_meta), errors=errors)
 
     if "risk_level" in metadata:
-        expect(metadata["risk_level"] in ALLOWED_RISK, path, f"metadata.risk_level must be one of {sorted(ALLOWED_RISK)}", errors)
+        expect(metadata["risk_level"] in ALLOWED_RISK, path, "metadata.risk_level must be one of %s", _ALLOWED_RISK_SORTED, errors=errors)
     if "rollout_strategy" in metadata:
-        expect(metadata["rollout_strategy"] in ALLOWED_ROLLOUT, path, f"metadata.rollout_strategy must be one of {sorted(ALLOWED_ROLLOUT)}", errors)
+        expect(metadata["rollout_strategy"] in ALLOWED_ROLLOUT, path, "metadata.rollout_strategy must be one of %s", _ALLOWED_ROLLOUT_SORTED, errors=errors)
 
     # ring scoping
     supported_rings = scope.get("supported_rings")
     if supported_rings is not None:
-        expect(isinstance(supported_rings, list) and supported_rings, path, "scope.supported_rings must be a non-empty list", errors)
+        expect(isinstance(supported_rings, list) and supported_rings, path, "scope.supported_rings must be a non-empty list", errors=errors)
         if isinstance(supported_rings, list):
             invalid = [r for r in supported_rings if r not in ALLOWED_RINGS]
-            expect(not invalid, path, f"scope.supported_rings contains invalid ring(s): {invalid}", errors)
+            expect(not invalid, path, "scope.supported_rings contains invalid ring(s): %s", invalid, errors=errors)
+
+    return True
+
+
+def lint_policy(path: Path, p: Dict[str, Any]) -> List[LintError]:
+    errors: List[LintError] = []
+
+    # Fast path: one compiled validator call for the per-field checks; the
+    # Python checks only run when it fails, to report every issue by name.
+    if not schema_ok(p) and not lint_fields(path, p, errors):
+        return errors
+
+    name = p.get("name")
+    platform = p.get("platform")
+    metadata = p.get("metadata") or {}
+    settings = p.get("settings") or {}
 
     # Jamf-specific: if platform macos and this is meant to be a config profile,
     # require an XML payload.
@@ -97,20 +171,20 @@ def lint_policy(path: Path, p: Dict[str, Any]) -> List[LintError]:
             expect(isinstance(xml_payload, str) and xml_payload.strip().startswith("<?xml"),
                    path,
                    "macOS Jamf profile must include settings.profile_plist_xml containing plist XML",
-                   errors)
+                   errors=errors)
 
     # break-glass guardrails
     if isinstance(name, str) and name in BREAK_GLASS_NAMES:
-        expect(metadata.get("rollout_strategy") == "manual-only", path, "break-glass must have rollout_strategy=manual-only", errors)
-        expect(metadata.get("risk_level") == "critical", path, "break-glass must have risk_level=critical", errors)
-        expect(metadata.get("emergency_use_only") is True, path, "break-glass must set metadata.emergency_use_only=true", errors)
+        expect(metadata.get("rollout_strategy") == "manual-only", path, "break-glass must have rollout_strategy=manual-only", errors=errors)
+        expect(metadata.get("risk_level") == "critical", path, "break-glass must have risk_level=critical", errors=errors)
+        expect(metadata.get("emergency_use_only") is True, path, "break-glass must set metadata.emergency_use_only=true", errors=errors)
 
         tc = p.get("time_constraints") or {}
-        expect(isinstance(tc, dict), path, "break-glass must include time_constraints object", errors)
+        expect(isinstance(tc, dict), path, "break-glass must include time_constraints object", errors=errors)
         if isinstance(tc, dict):
-            expect(tc.get("auto_expire") is True, path, "break-glass must enable time_constraints.auto_expire=true", errors)
+            expect(tc.get("auto_expire") is True, path, "break-glass must enable time_constraints.auto_expire=true", errors=errors)
             mdur = tc.get("max_duration_minutes")
-            expect(isinstance(mdur, int) and 1 <= mdur <= 240, path, "break-glass max_duration_minutes must be int 1..240", errors)
+            expect(isinstance(mdur, int) and 1 <= mdur <= 240, path, "break-glass max_duration_minutes must be int 1..240", errors=errors)
 
     return errors
 
@@ -130,9 +204,12 @@ def main() -> int:
         print(f"No JSON policies found under: {root}")
         return 2
 
+    # I/O bound: overlap reads across files; map() keeps the sorted order.
+    with ThreadPoolExecutor(max_workers=min(32, len(files))) as ex:
+        loaded = list(ex.map(load_json, files))
+
     all_errors: List[LintError] = []
-    for f in files:
-        obj, err = load_json(f)
+    for f, (obj, err) in zip(files, loaded):
         if err:
             all_errors.append(LintError(str(f), f"Invalid JSON: {err}"))
             continue
@@ -0,0 +1,137 @@
+"""
+Shared policy file parsing for the tools in this directory.
+
+policy_lint, apply_config and drift_check all read the same policy JSON.
+Parsing goes through parse_policy() / load_many() so that when they run in
+one process (e.g. a combined CI entrypoint that lints and then applies), each
+file is decoded once and later passes are a cache lookup.
+
+Cached objects are shared between callers: treat them as read-only.
+"""
+
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import sys
+from pathlib import Path
+from typing import Any, Dict, FrozenSet, Iterator, List, Tuple
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is the fallback
+    orjson = None
+
+MMAP_MIN_BYTES = 64 * 1024  # below this a plain read beats mmap setup
+
+# Directories never walked for policies (plus anything starting with ".").
+EXCLUDED_DIRS = frozenset({"node_modules", "__pycache__", "venv", ".venv", "target", "dist", "build"})
+
+# Keys every policy file repeats. orjson already shares short key strings
+# through its own cache; the stdlib path maps them onto one interned copy so a
+# large tree doesn't hold a fresh str per key per file.
+_KEY_POOL = {k: sys.intern(k) for k in (
+    "name", "platform", "version", "metadata", "settings", "scope",
+    "telemetry_expectations", "time_constraints",
+    "owner", "approver_groups", "change_ticket_required", "risk_level",
+    "rollout_strategy", "emergency_use_only",
+    "supported_rings", "auto_expire", "max_duration_minutes",
+)}
+
+
+def _intern_keys(pairs: List[Tuple[str, Any]]) -> Dict[str, Any]:
+    return {_KEY_POOL.get(k, k): v for k, v in pairs}
+
+
+def _json_loads(data: bytes) -> Any:
+    return json.loads(data, object_pairs_hook=_intern_keys)
+
+
+# Both accept bytes, so callers can skip the decode-to-str step.
+loads = orjson.loads if orjson is not None else _json_loads
+
+
+def dumps(obj: Any) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def canonical_dumps(obj: Any) -> bytes:
+    """Sorted-key, compact JSON: the same bytes for equal values, for hashing."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def read_json(path: str | os.PathLike[str]) -> Any:
+    with open(path, "rb") as f:
+        if orjson is None or os.fstat(f.fileno()).st_size < MMAP_MIN_BYTES:
+            return loads(f.read())
+        # large files: let orjson parse straight from the page cache
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as mv:
+            return orjson.loads(mv)
+
+
+# path -> parsed policy, filled by parse_policy() and load_many()
+_parsed: Dict[str, Any] = {}
+
+
+def parse_policy(path_str: str, raw: bytes | None = None) -> Any:
+    """
+    Return the parsed policy at path_str, reading it only on first use.
+
+    Pass raw when the caller already has the file's bytes (e.g. to hash them):
+    those bytes are decoded and cached instead of reading the file again, so
+    later passes see exactly what this caller saw.
+    """
+    if raw is not None:
+        obj = _parsed[path_str] = loads(raw)
+        return obj
+    obj = _parsed.get(path_str)
+    if obj is None:
+        obj = _parsed[path_str] = read_json(path_str)
+    return obj
+
+
+def load_many(paths: List[str]) -> List[Any]:
+    """
+    parse_policy() for many paths, in the given order. Cached entries are
+    returned as-is; only the misses are read, and they are added to the cache.
+
+    Deliberately serial: a process pool has to pickle every result back, and
+    unpickling it in this process costs about as much as decoding the file
+    here (more with orjson), so no number of workers comes out ahead. Results
+    parsed here also keep the shared _KEY_POOL keys.
+    """
+    for p in paths:
+        if p not in _parsed:
+            _parsed[p] = read_json(p)
+    return [_parsed[p] for p in paths]
+
+
+def iter_json(root: str | os.PathLike[str], exclude: FrozenSet[str] = EXCLUDED_DIRS) -> Iterator[str]:
+    """
+    Yield paths of *.json files under root, in no particular order.
+
+    Uses os.scandir so the entry type comes from readdir instead of a stat per
+    entry. Symlinked directories are not followed, same as Path.rglob. Hidden
+    directories and those named in exclude are not descended into.
+    """
+    stack = [os.fspath(root)]
+    while stack:
+        with os.scandir(stack.pop()) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if not (entry.name.startswith(".") or entry.name in exclude):
+                        stack.append(entry.path)
+                elif entry.name.endswith(".json"):
+                    yield entry.path
+
+
+def list_json(root: str | os.PathLike[str]) -> List[str]:
+    """iter_json() in the same order as sorted(Path(root).rglob("*.json"))."""
+    # Path ordering compares component by component ("a/b.json" < "a-b.json"),
+    # which plain string sorting does not.
+    return sorted(iter_json(root), key=Path)
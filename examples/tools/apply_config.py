@@ -15,19 +15,31 @@ This is vendor-neutral. Replace the `Connector` methods with real APIs:
 from __future__ import annotations
 
 import argparse
-import json
+import asyncio
+import hashlib
 import os
 import tarfile
-from dataclasses import dataclass
+from collections import Counter
+from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+from _policy_io import EXCLUDED_DIRS, canonical_dumps, dumps, list_json, load_many, loads
 
 
 ALLOWED_RINGS = {"qa", "security", "early", "global"}
 
+ARTIFACT_POLICIES_PREFIX = "endpoint-config/policies/"
+TAR_BUFSIZE = 2 * 1024 * 1024  # fewer read syscalls on large artifacts
+
+# apply_all_async(): policies per bulk_apply() call, and max in-flight
+# single calls for connectors without bulk endpoints.
+BULK_APPLY_CHUNK = 100
+ASYNC_CONCURRENCY = 16
+
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ApplyResult:
     policy_name: str
     status: str  # applied|skipped|no_change|failed
@@ -50,39 +62,73 @@ class Connector:
         # In production: GET policy from API
         return None
 
+    def get_current_hash(self, name: str) -> Optional[bytes]:
+        # In production: cheap ETag/HEAD-style call returning settings_hash() of
+        # what is deployed; None means unknown, and apply_all() falls back to a
+        # full get_current_policy() compare.
+        return None
+
     def apply_policy(self, policy: Dict[str, Any]) -> ApplyResult:
         # In production: create/update policy via API
         return ApplyResult(policy_name=policy["name"], status="applied", detail="demo apply (replace with API call)")
 
+    def bulk_get_current(self, names: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        # In production: one batched/list GET instead of a round-trip per name
+        return {name: self.get_current_policy(name) for name in names}
+
+    def bulk_apply(self, policies: List[Dict[str, Any]]) -> List[ApplyResult]:
+        # In production: batch create/update endpoint (one result per policy, same order).
+        # A failure on one policy must not fail the rest, same as apply_all().
+        results: List[ApplyResult] = []
+        for pol in policies:
+            try:
+                results.append(self.apply_policy(pol))
+            except Exception as e:
+                results.append(ApplyResult(policy_name=pol.get("name", "unknown"), status="failed", detail=str(e)))
+        return results
+
     def rollback_to_last_known_good(self, ring: str, reason: str) -> None:
         # In production: revert ring to previous artifact version
         pass
 
 
+def settings_hash(settings: Any) -> bytes:
+    """16-byte blake2b of the canonical (sorted-key, compact) JSON of settings."""
+    return hashlib.blake2b(canonical_dumps(settings), digest_size=16).digest()
+
+
 def now_utc() -> str:
     return datetime.now(timezone.utc).isoformat().replace("+00:00", "Z")
 
 
-def extract_artifact(artifact_path: Path, workdir: Path) -> Path:
+def load_policies_from_tar(artifact_path: Path) -> List[Dict[str, Any]]:
     """
-    Extract artifact (.tgz) into workdir and return extracted policies dir path.
-    Expected structure inside tar:
+    Parse policies straight out of an artifact (.tgz) in one streaming pass,
+    without extracting to disk and re-reading. Expected structure inside tar:
       endpoint-config/policies/*.json
+    Directories that iter_json() skips (hidden or EXCLUDED_DIRS) are skipped
+    here too, so --artifact and --policies load the same set. Policies are
+    returned in sorted member-name order.
     """
-    workdir.mkdir(parents=True, exist_ok=True)
-    with tarfile.open(artifact_path, "r:gz") as tf:
-        tf.extractall(path=workdir)
-    policies_dir = workdir / "endpoint-config" / "policies"
-    if not policies_dir.exists():
-        raise RuntimeError(f"Artifact missing expected path: {policies_dir}")
-    return policies_dir
+    found: List[Tuple[str, Dict[str, Any]]] = []
+    with tarfile.open(artifact_path, "r|gz", bufsize=TAR_BUFSIZE) as tf:
+        for member in tf:
+            name = member.name.removeprefix("./")
+            if not (member.isfile() and name.startswith(ARTIFACT_POLICIES_PREFIX) and name.endswith(".json")):
+                continue
+            subdirs = name[len(ARTIFACT_POLICIES_PREFIX):].split("/")[:-1]
+            if any(d.startswith(".") or d in EXCLUDED_DIRS for d in subdirs):
+                continue
+            f = tf.extractfile(member)
+            found.append((name, loads(f.read())))
+    if not found:
+        raise RuntimeError(f"Artifact has no policies under: {ARTIFACT_POLICIES_PREFIX}")
+    found.sort(key=lambda item: item[0])
+    return [obj for _, obj in found]
 
 
 def load_policies(policies_dir: Path) -> List[Dict[str, Any]]:
-    policies: List[Dict[str, Any]] = []
-    for p in sorted(policies_dir.rglob("*.json")):
-        policies.append(json.loads(p.read_text(encoding="utf-8")))
-    return policies
+    return load_many(list_json(policies_dir))
 
 
 def is_policy_allowed_in_ring(policy: Dict[str, Any], ring: str) -> bool:
@@ -95,55 +141,165 @@ def is_policy_allowed_in_ring(policy: Dict[str, Any], ring: str) -> bool:
     return False
 
 
-def apply_all(conn: Connector, policies: List[Dict[str, Any]], ring: str) -> List[ApplyResult]:
+def skip_reason(policy: Dict[str, Any], ring: str) -> Optional[str]:
+    if not is_policy_allowed_in_ring(policy, ring):
+        return f"not allowed in ring={ring}"
+
+    # Break-glass policies must never be applied via normal ring rollouts
+    md = policy.get("metadata") or {}
+    if md.get("emergency_use_only") is True and ring != "break-glass":
+        return "emergency-use-only policy"
+    return None
+
+
+def apply_all(conn: Connector, policies: List[Dict[str, Any]], ring: str) -> Tuple[List[ApplyResult], Counter]:
+    """Returns the results plus a per-status Counter tallied as they are produced."""
     results: List[ApplyResult] = []
+    counts: Counter = Counter()
+
+    def record(r: ApplyResult) -> None:
+        results.append(r)
+        counts[r.status] += 1
 
     for pol in policies:
         name = pol.get("name", "unknown")
-        if not is_policy_allowed_in_ring(pol, ring):
-            results.append(ApplyResult(policy_name=name, status="skipped", detail=f"not allowed in ring={ring}"))
+        reason = skip_reason(pol, ring)
+        if reason:
+            record(ApplyResult(policy_name=name, status="skipped", detail=reason))
             continue
 
-        # Break-glass policies must never be applied via normal ring rollouts
-        md = pol.get("metadata") or {}
-        if md.get("emergency_use_only") is True and ring != "break-glass":
-            results.append(ApplyResult(policy_name=name, status="skipped", detail="emergency-use-only policy"))
+        # Idempotency seam: a matching hash means no change without fetching
+        # the full remote policy.
+        desired_settings = pol.get("settings", {})
+        current_hash = conn.get_current_hash(name)
+        if current_hash is not None and current_hash == settings_hash(desired_settings):
+            record(ApplyResult(policy_name=name, status="no_change", detail="already compliant"))
             continue
 
-        # Idempotency seam:
         current = conn.get_current_policy(name)
-        desired_settings = pol.get("settings", {})
-
         if current is not None:
             current_settings = current.get("settings", {})
             if current_settings == desired_settings:
-                results.append(ApplyResult(policy_name=name, status="no_change", detail="already compliant"))
+                record(ApplyResult(policy_name=name, status="no_change", detail="already compliant"))
                 continue
 
         # Apply/update
         try:
-            results.append(conn.apply_policy(pol))
+            record(conn.apply_policy(pol))
+        except Exception as e:
+            record(ApplyResult(policy_name=name, status="failed", detail=str(e)))
+
+    return results, counts
+
+
+async def apply_all_async(conn: Connector, policies: List[Dict[str, Any]], ring: str) -> Tuple[List[ApplyResult], Counter]:
+    """
+    Same outcome as apply_all(), but with the remote round-trips overlapped:
+    the get_current_hash() preflight for every candidate, one
+    bulk_get_current() for those it didn't settle, a local diff, then
+    bulk_apply() in chunks of BULK_APPLY_CHUNK. Connectors without bulk
+    methods get their single calls run concurrently (ASYNC_CONCURRENCY at a
+    time). Connector methods are sync, so they run in worker threads.
+    Results keep the input policy order.
+    """
+    results: List[Optional[ApplyResult]] = [None] * len(policies)
+    sem = asyncio.Semaphore(ASYNC_CONCURRENCY)
+
+    async def bounded(fn: Any, *args: Any) -> Any:
+        async with sem:
+            return await asyncio.to_thread(fn, *args)
+
+    candidates: List[int] = []
+    for i, pol in enumerate(policies):
+        reason = skip_reason(pol, ring)
+        if reason:
+            results[i] = ApplyResult(policy_name=pol.get("name", "unknown"), status="skipped", detail=reason)
+        else:
+            candidates.append(i)
+
+    # Hash preflight, as in apply_all(): a match is no_change without a fetch.
+    hashes = await asyncio.gather(*(bounded(conn.get_current_hash, policies[i].get("name", "unknown")) for i in candidates))
+    unsettled: List[int] = []
+    for i, current_hash in zip(candidates, hashes):
+        if current_hash is not None and current_hash == settings_hash(policies[i].get("settings", {})):
+            results[i] = ApplyResult(policy_name=policies[i].get("name", "unknown"), status="no_change", detail="already compliant")
+        else:
+            unsettled.append(i)
+    candidates = unsettled
+
+    # Idempotency seam, batched:
+    names = [policies[i].get("name", "unknown") for i in candidates]
+    if hasattr(conn, "bulk_get_current"):
+        current_by_name = await asyncio.to_thread(conn.bulk_get_current, names)
+    else:
+        current_by_name = dict(zip(names, await asyncio.gather(*(bounded(conn.get_current_policy, n) for n in names))))
+
+    to_apply: List[int] = []
+    for i, name in zip(candidates, names):
+        current = current_by_name.get(name)
+        if current is not None and current.get("settings", {}) == policies[i].get("settings", {}):
+            results[i] = ApplyResult(policy_name=name, status="no_change", detail="already compliant")
+        else:
+            to_apply.append(i)
+
+    # Apply/update
+    async def apply_chunk(idx: List[int]) -> None:
+        try:
+            applied = await bounded(conn.bulk_apply, [policies[i] for i in idx])
+            if len(applied) != len(idx):
+                raise RuntimeError(f"bulk_apply returned {len(applied)} result(s) for {len(idx)} policies")
+            for i, r in zip(idx, applied):
+                results[i] = r
+        except Exception as e:
+            for i in idx:
+                results[i] = ApplyResult(policy_name=policies[i].get("name", "unknown"), status="failed", detail=str(e))
+
+    async def apply_one(i: int) -> None:
+        try:
+            results[i] = await bounded(conn.apply_policy, policies[i])
         except Exception as e:
-            results.append(ApplyResult(policy_name=name, status="failed", detail=str(e)))
-
-    return results
-
-
-def write_audit_log(out_path: Path, ring: str, change_id: str | None, results: List[ApplyResult]) -> None:
-    payload = {
-        "timestamp": now_utc(),
-        "ring": ring,
-        "change_id": change_id,
-        "results": [r.__dict__ for r in results],
-        "summary": {
-            "applied": sum(1 for r in results if r.status == "applied"),
-            "no_change": sum(1 for r in results if r.status == "no_change"),
-            "skipped": sum(1 for r in results if r.status == "skipped"),
-            "failed": sum(1 for r in results if r.status == "failed"),
-        },
+            results[i] = ApplyResult(policy_name=policies[i].get("name", "unknown"), status="failed", detail=str(e))
+
+    if hasattr(conn, "bulk_apply"):
+        chunks = [to_apply[j:j + BULK_APPLY_CHUNK] for j in range(0, len(to_apply), BULK_APPLY_CHUNK)]
+        await asyncio.gather(*(apply_chunk(c) for c in chunks))
+    else:
+        await asyncio.gather(*(apply_one(i) for i in to_apply))
+
+    # One pass to tally, as apply_all() does via record(). A slot nothing
+    # filled is a failure, not something to drop from the audit.
+    ordered: List[ApplyResult] = []
+    counts: Counter = Counter()
+    for pol, r in zip(policies, results):
+        if r is None:
+            r = ApplyResult(policy_name=pol.get("name", "unknown"), status="failed", detail="no result from connector")
+        ordered.append(r)
+        counts[r.status] += 1
+    return ordered, counts
+
+
+def write_audit_log(out_path: Path, ring: str, change_id: str | None, results: List[ApplyResult], counts: Counter) -> None:
+    """
+    Written incrementally, one result per line, so peak memory stays at one
+    serialized result rather than the whole document.
+    """
+    summary = {
+        "applied": counts["applied"],
+        "no_change": counts["no_change"],
+        "skipped": counts["skipped"],
+        "failed": counts["failed"],
     }
     out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(payload, indent=2), encoding="utf-8")
+    with out_path.open("wb") as f:
+        f.write(b'{\n  "timestamp": ' + dumps(now_utc()))
+        f.write(b',\n  "ring": ' + dumps(ring))
+        f.write(b',\n  "change_id": ' + dumps(change_id))
+        f.write(b',\n  "results": [')
+        sep = b"\n    "
+        for r in results:
+            f.write(sep + dumps(asdict(r)))
+            sep = b",\n    "
+        f.write(b'\n  ],\n  "summary": ' + dumps(summary) + b"\n}\n")
 
 
 def main() -> int:
@@ -153,6 +309,7 @@ def main() -> int:
     ap.add_argument("--policies", type=Path, required=False, help="Directory containing JSON policies")
     ap.add_argument("--artifact", type=Path, required=False, help="Packaged .tgz artifact containing policies")
     ap.add_argument("--audit-out", type=Path, default=Path("out/audit_apply.json"))
+    ap.add_argument("--bulk", action="store_true", help="Batch/overlap connector calls (apply_all_async)")
     args = ap.parse_args()
 
     ring = args.ring.strip().lower()
@@ -167,34 +324,34 @@ def main() -> int:
         # For interview repo: allow empty token but clearly warn.
         print("WARN: ENDPOINT_API_TOKEN not set (demo mode).")
 
-    # Resolve policies directory
-    policies_dir: Path
-    tmp_dir = Path(".tmp_apply")
+    # Load policies: stream from the artifact, or read the directory
     if args.artifact:
         if not args.artifact.exists():
             raise SystemExit(f"Artifact not found: {args.artifact}")
-        policies_dir = extract_artifact(args.artifact, tmp_dir)
+        policies = load_policies_from_tar(args.artifact)
     else:
-        if not args.policies or not args.policies.exists():
-            raise SystemExit(f"Policies path not found: {args.policies}")
-        policies_dir = args.policies
+        if not args.policies or not args.policies.is_dir():
+            raise SystemExit(f"Policies path not found or not a directory: {args.policies}")
+        policies = load_policies(args.policies)
 
-    policies = load_policies(policies_dir)
     conn = Connector(token=token)
 
-    results = apply_all(conn, policies, ring)
+    if args.bulk:
+        results, counts = asyncio.run(apply_all_async(conn, policies, ring))
+    else:
+        results, counts = apply_all(conn, policies, ring)
 
-    write_audit_log(args.audit_out, ring=ring, change_id=args.change_id, results=results)
+    write_audit_log(args.audit_out, ring=ring, change_id=args.change_id, results=results, counts=counts)
 
-    failed = [r for r in results if r.status == "failed"]
-    print(f"Applied={sum(1 for r in results if r.status=='applied')}, "
-          f"NoChange={sum(1 for r in results if r.status=='no_change')}, "
-          f"Skipped={sum(1 for r in results if r.status=='skipped')}, "
-          f"Failed={len(failed)}")
+    print(f"Applied={counts['applied']}, "
+          f"NoChange={counts['no_change']}, "
+          f"Skipped={counts['skipped']}, "
+          f"Failed={counts['failed']}")
 
-    if failed:
-        for r in failed:
-            print(f"FAIL: {r.policy_name}: {r.detail}")
+    if counts["failed"]:
+        for r in results:
+            if r.status == "failed":
+                print(f"FAIL: {r.policy_name}: {r.detail}")
         return 1
 
     return 0
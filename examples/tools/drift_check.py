@@ -16,12 +16,14 @@ from __future__ import annotations
 
 import argparse
 import json
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, Tuple
 
+from _policy_io import list_json, load_many, read_json
 
-@dataclass
+
+@dataclass(slots=True, frozen=True)
 class DriftItem:
     status: str
     desired: Any | None = None
@@ -29,9 +31,9 @@ class DriftItem:
 
 
 def load_desired(dir_path: Path) -> Dict[str, Dict[str, Any]]:
+    objs = load_many(list_json(dir_path))
     desired: Dict[str, Dict[str, Any]] = {}
-    for p in sorted(dir_path.rglob("*.json")):
-        obj = json.loads(p.read_text(encoding="utf-8"))
+    for obj in objs:
         name = obj.get("name")
         if not name:
             continue
@@ -40,7 +42,7 @@ def load_desired(dir_path: Path) -> Dict[str, Dict[str, Any]]:
 
 
 def load_actual(snapshot_path: Path) -> Dict[str, Dict[str, Any]]:
-    return json.loads(snapshot_path.read_text(encoding="utf-8"))
+    return read_json(snapshot_path)
 
 
 def normalize_settings(settings: Any) -> Any:
@@ -56,6 +58,26 @@ def normalize_settings(settings: Any) -> Any:
     return settings
 
 
+def settings_equal(a: Any, b: Any) -> bool:
+    """
+    Structural equality that stops at the first differing leaf and builds no
+    intermediate containers. Key order is ignored; list order is not. Scalar
+    types must match too, so 1 vs 1.0 or 1 vs true counts as drift.
+    """
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        if len(a) != len(b):
+            return False
+        for k, v in a.items():
+            if k not in b or not settings_equal(v, b[k]):
+                return False
+        return True
+    if isinstance(a, list):
+        return len(a) == len(b) and all(settings_equal(x, y) for x, y in zip(a, b))
+    return a == b
+
+
 def compare(desired: Dict[str, Dict[str, Any]], actual: Dict[str, Dict[str, Any]]) -> Tuple[Dict[str, DriftItem], int]:
     drift: Dict[str, DriftItem] = {}
     rc = 0
@@ -68,14 +90,15 @@ def compare(desired: Dict[str, Dict[str, Any]], actual: Dict[str, Dict[str, Any]
             rc = 1
             continue
 
-        d_settings = normalize_settings(d.get("settings", {}))
-        a_settings = normalize_settings(a.get("settings", {}))
+        d_settings = d.get("settings", {})
+        a_settings = a.get("settings", {})
 
-        if d_settings != a_settings:
+        # Normalized copies are only built for the report, on mismatch.
+        if not settings_equal(d_settings, a_settings):
             drift[name] = DriftItem(
                 status="settings_drift",
-                desired=d_settings,
-                actual=a_settings
+                desired=normalize_settings(d_settings),
+                actual=normalize_settings(a_settings)
             )
             rc = 1
 
@@ -94,8 +117,8 @@ def main() -> int:
     ap.add_argument("--actual", required=True, type=Path)
     args = ap.parse_args()
 
-    if not args.desired.exists():
-        raise SystemExit(f"Desired path not found: {args.desired}")
+    if not args.desired.is_dir():
+        raise SystemExit(f"Desired path not found or not a directory: {args.desired}")
     if not args.actual.exists():
         raise SystemExit(f"Actual snapshot not found: {args.actual}")
 
@@ -106,7 +129,7 @@ def main() -> int:
 
     out = {
         "count": len(drift),
-        "drift": {k: v.__dict__ for k, v in drift.items()},
+        "drift": {k: asdict(v) for k, v in drift.items()},
     }
     print(json.dumps(out, indent=2))
     return rc
@@ -9,16 +9,25 @@ Exit codes:
   0 = OK
   1 = lint errors
   2 = usage / path errors
+
+Results are cached per file content in .cache/policy_lint.json so unchanged
+files are not re-parsed on the next run. Set POLICY_LINT_CACHE to use a
+different file, or to an empty string to disable the cache.
 """
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
 import re
 import sys
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from string import Template
+from typing import Any, Callable, Dict, List
+
+from _policy_io import list_json, loads, parse_policy
 
 SEMVER_RE = re.compile(r"^(0|[1-9]\d*)\.(0|[1-9]\d*)\.(0|[1-9]\d*)(?:[-+].+)?$")
 
@@ -41,27 +50,33 @@ ALLOWED_RINGS = {"qa", "security", "early", "global"}
 # Policies with this name are treated as special and require strict handling.
 BREAK_GLASS_NAMES = {"break-glass-exception", "break_glass_exception"}
 
+# Bump whenever lint rules or messages change; it invalidates cached results.
+_LINT_VERSION = "1"
+DEFAULT_CACHE_PATH = Path(".cache/policy_lint.json")
 
-def load_json(path: Path) -> Tuple[Dict[str, Any] | None, str | None]:
-    try:
-        return json.loads(path.read_text(encoding="utf-8")), None
-    except Exception as e:
-        return None, str(e)
+# Error messages built once at import rather than on every lint_policy() call.
+_ALLOWED_PLATFORMS_MSG = f"platform must be one of {sorted(ALLOWED_PLATFORMS)}"
+_ALLOWED_RISK_MSG = f"metadata.risk_level must be one of {sorted(ALLOWED_RISK)}"
+_ALLOWED_ROLLOUT_MSG = f"metadata.rollout_strategy must be one of {sorted(ALLOWED_ROLLOUT)}"
 
 
-def _expect(cond: bool, path: Path, msg: str, errors: List[LintError]) -> None:
-    if not cond:
-        errors.append(LintError(str(path), msg))
+def _set_literal(values: set) -> str:
+    # A set display used only with `in` is folded to a frozenset constant.
+    return "{" + ", ".join(repr(v) for v in sorted(values)) + "}"
 
 
-def lint_policy(path: Path, policy: Dict[str, Any]) -> List[LintError]:
-    errors: List[LintError] = []
+# The rules below are compiled once into a single _validate() function, with
+# the allowed sets and fixed messages inlined as constants. Checks run in the
+# order listed and each failure appends one LintError.
+_VALIDATOR_TEMPLATE = Template('''
+def _validate(path, policy, errors):
+    path = str(path)
 
     # Required fields
-    missing = REQUIRED_TOP_LEVEL - set(policy.keys())
-    _expect(not missing, path, f"Missing top-level fields: {sorted(missing)}", errors)
+    missing = REQUIRED_TOP_LEVEL.difference(policy)
     if missing:
-        return errors  # can't continue reliably
+        errors.append(LintError(path, f"Missing top-level fields: {sorted(missing)}"))
+        return  # can't continue reliably
 
     name = policy.get("name")
     platform = policy.get("platform")
@@ -72,59 +87,141 @@ def lint_policy(path: Path, policy: Dict[str, Any]) -> List[LintError]:
     telemetry = policy.get("telemetry_expectations") or {}
 
     # Types
-    _expect(isinstance(name, str) and name.strip(), path, "name must be a non-empty string", errors)
-    _expect(platform in ALLOWED_PLATFORMS, path, f"platform must be one of {sorted(ALLOWED_PLATFORMS)}", errors)
-    _expect(isinstance(version, str) and SEMVER_RE.match(version) is not None, path, "version must be semver (e.g., 1.2.3)", errors)
-    _expect(isinstance(metadata, dict), path, "metadata must be an object", errors)
-    _expect(isinstance(settings, dict), path, "settings must be an object", errors)
+    if not (isinstance(name, str) and name.strip()):
+        errors.append(LintError(path, "name must be a non-empty string"))
+    if platform not in $platforms:
+        errors.append(LintError(path, $platforms_msg))
+    if not (isinstance(version, str) and SEMVER_RE.fullmatch(version) is not None):
+        errors.append(LintError(path, "version must be semver (e.g., 1.2.3)"))
+    if not isinstance(metadata, dict):
+        errors.append(LintError(path, "metadata must be an object"))
+    if not isinstance(settings, dict):
+        errors.append(LintError(path, "settings must be an object"))
 
     # Metadata required keys
-    missing_meta = REQUIRED_METADATA - set(metadata.keys())
-    _expect(not missing_meta, path, f"Missing metadata fields: {sorted(missing_meta)}", errors)
+    missing_meta = REQUIRED_METADATA.difference(metadata)
+    if missing_meta:
+        errors.append(LintError(path, f"Missing metadata fields: {sorted(missing_meta)}"))
 
     # Metadata value checks (only if present)
-    if "risk_level" in metadata:
-        _expect(metadata["risk_level"] in ALLOWED_RISK, path, f"metadata.risk_level must be one of {sorted(ALLOWED_RISK)}", errors)
-    if "rollout_strategy" in metadata:
-        _expect(metadata["rollout_strategy"] in ALLOWED_ROLLOUT, path, f"metadata.rollout_strategy must be one of {sorted(ALLOWED_ROLLOUT)}", errors)
-    if "approver_groups" in metadata:
-        _expect(isinstance(metadata["approver_groups"], list) and metadata["approver_groups"], path, "metadata.approver_groups must be a non-empty list", errors)
+    if "risk_level" in metadata and metadata["risk_level"] not in $risk:
+        errors.append(LintError(path, $risk_msg))
+    if "rollout_strategy" in metadata and metadata["rollout_strategy"] not in $rollout:
+        errors.append(LintError(path, $rollout_msg))
+    if "approver_groups" in metadata and not (isinstance(metadata["approver_groups"], list) and metadata["approver_groups"]):
+        errors.append(LintError(path, "metadata.approver_groups must be a non-empty list"))
 
     # Scope sanity
     if scope:
-        _expect(isinstance(scope, dict), path, "scope must be an object", errors)
+        if not isinstance(scope, dict):
+            errors.append(LintError(path, "scope must be an object"))
 
         supported_rings = scope.get("supported_rings")
         if supported_rings is not None:
-            _expect(isinstance(supported_rings, list) and supported_rings, path, "scope.supported_rings must be a non-empty list", errors)
+            if not (isinstance(supported_rings, list) and supported_rings):
+                errors.append(LintError(path, "scope.supported_rings must be a non-empty list"))
             if isinstance(supported_rings, list):
-                invalid = [r for r in supported_rings if r not in ALLOWED_RINGS]
-                _expect(not invalid, path, f"scope.supported_rings contains invalid ring(s): {invalid}", errors)
+                invalid = [r for r in supported_rings if r not in $rings]
+                if invalid:
+                    errors.append(LintError(path, f"scope.supported_rings contains invalid ring(s): {invalid}"))
 
     # Telemetry thresholds sanity: values between 0 and 1
     if telemetry:
-        _expect(isinstance(telemetry, dict), path, "telemetry_expectations must be an object", errors)
+        if not isinstance(telemetry, dict):
+            errors.append(LintError(path, "telemetry_expectations must be an object"))
         for k, v in telemetry.items():
-            if isinstance(v, (int, float)):
-                _expect(0 <= float(v) <= 1, path, f"telemetry_expectations.{k} must be between 0 and 1", errors)
+            if isinstance(v, (int, float)) and not 0 <= float(v) <= 1:
+                errors.append(LintError(path, f"telemetry_expectations.{k} must be between 0 and 1"))
 
     # Break-glass guardrails
-    if isinstance(name, str) and name in BREAK_GLASS_NAMES:
+    if isinstance(name, str) and name in $break_glass:
         # Must be manual-only and critical
         if isinstance(metadata, dict):
-            _expect(metadata.get("rollout_strategy") == "manual-only", path, "break-glass must have rollout_strategy=manual-only", errors)
-            _expect(metadata.get("risk_level") == "critical", path, "break-glass must have risk_level=critical", errors)
-            _expect(metadata.get("emergency_use_only") is True, path, "break-glass must set metadata.emergency_use_only=true", errors)
+            if metadata.get("rollout_strategy") != "manual-only":
+                errors.append(LintError(path, "break-glass must have rollout_strategy=manual-only"))
+            if metadata.get("risk_level") != "critical":
+                errors.append(LintError(path, "break-glass must have risk_level=critical"))
+            if metadata.get("emergency_use_only") is not True:
+                errors.append(LintError(path, "break-glass must set metadata.emergency_use_only=true"))
 
         # Must have TTL / auto-expire
         tc = policy.get("time_constraints") or {}
-        _expect(isinstance(tc, dict) and tc.get("auto_expire") is True, path, "break-glass must enable time_constraints.auto_expire=true", errors)
-        _expect(isinstance(tc.get("max_duration_minutes"), int) and 1 <= tc["max_duration_minutes"] <= 240,
-                path, "break-glass max_duration_minutes must be an int between 1 and 240", errors)
+        if not (isinstance(tc, dict) and tc.get("auto_expire") is True):
+            errors.append(LintError(path, "break-glass must enable time_constraints.auto_expire=true"))
+        if not (isinstance(tc.get("max_duration_minutes"), int) and 1 <= tc["max_duration_minutes"] <= 240):
+            errors.append(LintError(path, "break-glass max_duration_minutes must be an int between 1 and 240"))
+''')
+
+
+def _compile_validator() -> Callable[[Path, Dict[str, Any], List[LintError]], None]:
+    src = _VALIDATOR_TEMPLATE.substitute(
+        platforms=_set_literal(ALLOWED_PLATFORMS),
+        platforms_msg=repr(_ALLOWED_PLATFORMS_MSG),
+        risk=_set_literal(ALLOWED_RISK),
+        risk_msg=repr(_ALLOWED_RISK_MSG),
+        rollout=_set_literal(ALLOWED_ROLLOUT),
+        rollout_msg=repr(_ALLOWED_ROLLOUT_MSG),
+        rings=_set_literal(ALLOWED_RINGS),
+        break_glass=_set_literal(BREAK_GLASS_NAMES),
+    )
+    namespace = {
+        "LintError": LintError,
+        "SEMVER_RE": SEMVER_RE,
+        "REQUIRED_TOP_LEVEL": frozenset(REQUIRED_TOP_LEVEL),
+        "REQUIRED_METADATA": frozenset(REQUIRED_METADATA),
+    }
+    exec(compile(src, "<policy_lint validator>", "exec"), namespace)
+    return namespace["_validate"]
+
+
+_validate = _compile_validator()
+
 
+def lint_policy(path: Path, policy: Dict[str, Any]) -> List[LintError]:
+    errors: List[LintError] = []
+    _validate(path, policy, errors)
     return errors
 
 
+def _lint_messages(path: str, raw: bytes) -> List[str]:
+    # Decode the bytes that were hashed, so the cached verdict matches them.
+    try:
+        obj = parse_policy(path, raw)
+    except Exception as e:
+        return [f"Invalid JSON: {e}"]
+    return [e.message for e in lint_policy(path, obj or {})]
+
+
+def _cache_path() -> Path | None:
+    env = os.environ.get("POLICY_LINT_CACHE")
+    if env is None:
+        return DEFAULT_CACHE_PATH
+    return Path(env) if env else None
+
+
+def _load_cache(path: Path | None) -> Dict[str, List[str]]:
+    if path is None:
+        return {}
+    try:
+        cache = loads(path.read_bytes())
+    except Exception:
+        return {}  # missing or corrupt: start fresh
+    if not isinstance(cache, dict):
+        return {}
+    # Entries that aren't a list of messages are dropped, i.e. treated as misses.
+    return {k: v for k, v in cache.items() if isinstance(v, list) and all(isinstance(m, str) for m in v)}
+
+
+def _save_cache(path: Path | None, cache: Dict[str, List[str]]) -> None:
+    if path is None:
+        return
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text(json.dumps(cache, sort_keys=True), encoding="utf-8")
+    except OSError:
+        pass  # caching is best-effort (e.g. read-only checkout)
+
+
 def main() -> int:
     if len(sys.argv) != 2:
         print(__doc__.strip())
@@ -136,17 +233,32 @@ def main() -> int:
         return 2
 
     all_errors: List[LintError] = []
-    json_files = list(root.rglob("*.json"))
+    json_files = list_json(root)
     if not json_files:
         print(f"No JSON policies found under: {root}")
         return 2
 
-    for p in sorted(json_files):
-        obj, err = load_json(p)
-        if err:
-            all_errors.append(LintError(str(p), f"Invalid JSON: {err}"))
+    # content hash -> error messages ([] = clean); only this run's files are kept
+    cache_path = _cache_path()
+    cache = _load_cache(cache_path)
+    seen: Dict[str, List[str]] = {}
+
+    for p in json_files:
+        try:
+            with open(p, "rb") as f:
+                raw = f.read()
+        except OSError as e:
+            all_errors.append(LintError(p, f"Invalid JSON: {e}"))
             continue
-        all_errors.extend(lint_policy(p, obj or {}))
+        key = f"{_LINT_VERSION}:{hashlib.sha256(raw).hexdigest()}"
+        messages = cache.get(key)
+        if messages is None:
+            messages = _lint_messages(p, raw)
+        seen[key] = messages
+        all_errors.extend(LintError(p, m) for m in messages)
+
+    if seen != cache:
+        _save_cache(cache_path, seen)
 
     if all_errors:
         for e in all_errors: